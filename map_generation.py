@@ -1,17 +1,416 @@
 
+import asyncio
+import aiohttp
 import folium
 import branca
 import requests
-import polyline
-import time
+import gzip
+import json
 import os
 import math
+import numpy as np
 import pandas as pd
+import xlsxwriter
+from folium.plugins import FastMarkerCluster
 from geopy.distance import geodesic
+from numba import njit, prange, set_num_threads
+from requests.adapters import HTTPAdapter
+from scipy.spatial import cKDTree
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
 from typing import List, Dict, Tuple
 
+EARTH_RADIUS = 6371000  # Earth's radius in meters
+PLACES_MAX_RESULTS = 20  # Nearby Search page cap (maxResultCount)
+
+# Client-side marker factory for FastMarkerCluster rows of [lat, lon, popup_html]
+POI_MARKER_CALLBACK = """
+    function (row) {
+        var icon = L.AwesomeMarkers.icon({
+            icon: '%(icon)s', markerColor: '%(color)s', prefix: '%(prefix)s', iconColor: 'white'
+        });
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+        marker.bindPopup(row[2], {maxWidth: 300});
+        return marker;
+    }
+"""
+
+# Popup templates, filled with %-formatting once per marker
+BLIND_SPOT_POPUP = (
+    '<div style="font-family: Arial, sans-serif;">'
+    '<h4 style="color: red;">⚠️ BLIND SPOT WARNING ⚠️</h4>'
+    '<b>Turn Angle:</b> %.1f°<br>'
+    '<b>Hazard Level:</b> High<br>'
+    '<small>Exercise extreme caution!</small>'
+    '</div>'
+)
+TURN_POPUP = 'Turn Angle: %.1f°'
+POI_POPUP = (
+    '<div style="font-family: Arial, sans-serif;">'
+    '<h4>%s</h4>'
+    '<b>Type:</b> %s<br>'
+    '<b>Address:</b> %s<br>'
+    '<small>Lat: %s, Lon: %s</small>'
+    '</div>'
+)
+START_POPUP = (
+    '<div style="font-family: Arial, sans-serif;">'
+    '<h4>Route Information</h4>'
+    '<b>Start:</b> %s<br>'
+    '<b>Distance:</b> %s<br>'
+    '<b>Duration:</b> %s<br>'
+    '<b>Total Turns:</b> %d<br>'
+    '<b>Blind Spots:</b> %d<br>'
+    '<small>Exercise caution at marked hazard points</small>'
+    '</div>'
+)
+
+# Map legend, added to every route map
+LEGEND_HTML = '''
+<div style="position: fixed; 
+            top: 10px; right: 10px; width: 150px;
+            border:2px solid grey; z-index:9999; font-size:14px;
+            background-color: white;
+            padding: 10px;
+            border-radius: 5px;">
+    <h4 style="margin-bottom: 10px;">Legend</h4>
+    <div style="margin-bottom: 5px;"><i class="fa fa-plus fa-lg" style="color:red"></i> Hospital</div>
+    <div style="margin-bottom: 5px;"><i class="fa fa-shield fa-lg" style="color:blue"></i> Police</div>
+    <div style="margin-bottom: 5px;"><i class="fa fa-gas-pump fa-lg" style="color:orange"></i> Gas Station</div>
+    <div style="margin-bottom: 5px;"><i class="fa fa-train fa-lg" style="color:purple"></i> Train Station</div>
+    <div style="margin-bottom: 5px;"><i class="fa fa-refresh fa-lg" style="color:yellow"></i> Turn</div>
+    <div style="margin-bottom: 5px;"><i class="fa fa-exclamation-triangle fa-lg" style="color:red"></i> Blind Spot</div>
+    <div style="margin-bottom: 5px;"><i class="fa fa-flag fa-lg" style="color:green"></i> Start</div>
+    <div><i class="fa fa-flag-checkered fa-lg" style="color:red"></i> End</div>
+</div>
+'''
+
+
+# GPS tracking panel and script injected into every saved map
+GPS_TRACKING_HTML = """
+<div id="gps-tracking" style="
+    position: fixed; 
+    top: 10px; 
+    right: 10px; 
+    background: white; 
+    padding: 10px; 
+    border: 1px solid #ccc; 
+    z-index: 1000; 
+    font-family: Arial, sans-serif;
+">
+    <button id="start-tracking" style="
+        background-color: green; 
+        color: white; 
+        border: none; 
+        padding: 10px; 
+        margin-bottom: 10px;
+        cursor: pointer;
+    ">Start Tracking</button>
+    <div id="gps-status">GPS: Not Connected</div>
+    <div id="gps-coordinates"></div>
+    <div id="tracking-info"></div>
+</div>
+<script>
+function initGPS() {
+    const startButton = document.getElementById('start-tracking');
+    const gpsStatus = document.getElementById('gps-status');
+    const gpsCoordinates = document.getElementById('gps-coordinates');
+    const trackingInfo = document.getElementById('tracking-info');
+    let userMarker = null;
+    let trackingStarted = false;
+    let trackingStartTime = null;
+    let totalDistance = 0;
+    let previousPosition = null;
+
+    function updateGPSMarker(lat, lon) {
+        if (!userMarker) {
+            userMarker = L.marker([lat, lon], {
+                icon: L.divIcon({
+                    className: 'custom-gps-marker',
+                    html: `<div style="
+                        width: 30px; 
+                        height: 30px; 
+                        background-color: green; 
+                        border-radius: 50%; 
+                        border: 3px solid white;
+                        box-shadow: 0 0 15px rgba(0,255,0,0.5);
+                    "></div>`,
+                    iconSize: [30, 30],
+                    iconAnchor: [15, 15]
+                })
+            }).addTo(map);
+        } else {
+            // Calculate distance moved
+            if (previousPosition && trackingStarted) {
+                const distanceMoved = L.latLng([lat, lon]).distanceTo(previousPosition);
+                totalDistance += distanceMoved;
+            }
+            
+            userMarker.setLatLng([lat, lon]);
+            previousPosition = L.latLng([lat, lon]);
+        }
+        
+        // Center map on current location
+        map.setView([lat, lon], map.getZoom());
+    }
+
+    startButton.addEventListener('click', function() {
+        if (!trackingStarted) {
+            trackingStarted = true;
+            trackingStartTime = new Date();
+            startButton.textContent = 'Stop Tracking';
+            startButton.style.backgroundColor = 'red';
+            trackingInfo.innerHTML = 'Tracking started...';
+        } else {
+            trackingStarted = false;
+            const trackingDuration = (new Date() - trackingStartTime) / 1000 / 60; // minutes
+            trackingInfo.innerHTML = `
+                Tracking stopped<br>
+                Duration: ${trackingDuration.toFixed(2)} minutes<br>
+                Total Distance: ${(totalDistance / 1000).toFixed(2)} km
+            `;
+            startButton.textContent = 'Start Tracking';
+            startButton.style.backgroundColor = 'green';
+        }
+    });
+
+    if ('geolocation' in navigator) {
+        navigator.geolocation.watchPosition(
+            function(position) {
+                const lat = position.coords.latitude;
+                const lon = position.coords.longitude;
+                const accuracy = position.coords.accuracy;
+
+                updateGPSMarker(lat, lon);
+                
+                gpsStatus.innerHTML = 'GPS: Connected';
+                gpsCoordinates.innerHTML = `
+                    Latitude: ${lat.toFixed(6)}<br>
+                    Longitude: ${lon.toFixed(6)}<br>
+                    Accuracy: ${accuracy.toFixed(2)} meters
+                `;
+
+                if (trackingStarted) {
+                    trackingInfo.innerHTML = `
+                        Tracking Active<br>
+                        Total Distance: ${(totalDistance / 1000).toFixed(2)} km
+                    `;
+                }
+            },
+            function(error) {
+                gpsStatus.innerHTML = `GPS Error: ${error.message}`;
+                console.error('Geolocation error:', error);
+            },
+            {
+                enableHighAccuracy: true,
+                maximumAge: 30000,
+                timeout: 27000
+            }
+        );
+    } else {
+        gpsStatus.innerHTML = 'Geolocation not supported';
+    }
+}
+
+// Initialize GPS tracking after map load
+map.whenReady(initGPS);
+</script>
+"""
+
+
+class _RawElement(branca.element.Element):
+    """Element that renders a ready-made HTML/script string as-is.
+
+    folium.Element compiles its string into a Jinja template on construction;
+    fixed blocks like the legend and GPS panel never need that.
+    """
+
+    def __init__(self, content):
+        super().__init__()
+        self.content = content
+
+    def render(self, **kwargs):
+        return self.content
+
+
+class PrerenderedMarkerGroup(folium.FeatureGroup):
+    """FeatureGroup whose markers are emitted from a %-format template.
+
+    folium.Marker renders a Jinja template for the marker, its Icon and its
+    Popup. Markers added through add_marker() are formatted straight into
+    JavaScript instead and injected as a single script when the group renders.
+    """
+
+    _marker_script = 'L.marker([%r, %r], {icon: L.AwesomeMarkers.icon(%s)}).bindPopup(%s, {maxWidth: %d}).addTo(%s);\n'
+
+    def __init__(self, name=None, **kwargs):
+        super().__init__(name=name, **kwargs)
+        self._markers = []
+
+    def add_marker(self, location, popup_html, color, icon, prefix='fa', max_width=300):
+        icon_options = json.dumps({
+            'extraClasses': 'fa-rotate-0',
+            'icon': icon,
+            'iconColor': 'white',
+            'markerColor': color,
+            'prefix': prefix
+        })
+        self._markers.append((float(location[0]), float(location[1]), icon_options, json.dumps(popup_html), max_width))
+        return self
+
+    def render(self, **kwargs):
+        super().render(**kwargs)
+        name = self.get_name()
+        script = ''.join(self._marker_script % (marker + (name,)) for marker in self._markers)
+        self.get_root().script.add_child(_RawElement(script), name=name + '_markers')
+
+
+def _run(coro):
+    """Run coro to completion, also when called from inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # e.g. Jupyter: asyncio.run cannot nest, so run the coroutine on its own thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _project_equirectangular(points, cos_lat):
+    """Project (lat, lon) degrees onto a local plane in meters."""
+    rad = np.deg2rad(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+    return np.column_stack((rad[:, 0], rad[:, 1] * cos_lat)) * EARTH_RADIUS
+
+
+@njit(cache=True)
+def _decode_polyline_bytes(encoded, precision):
+    """Decode polyline ASCII bytes into an (N, 2) float64 array of (lat, lon)."""
+    # Each coordinate takes at least one byte, so a point takes at least two
+    n = encoded.shape[0]
+    out = np.empty((n // 2, 2), np.float64)
+    factor = 10.0 ** precision
+    index = 0
+    count = 0
+    lat = 0
+    lon = 0
+    while index < n:
+        for axis in range(2):
+            shift = 0
+            result = 0
+            while True:
+                # Numba does not bounds-check, so truncated input must be caught here
+                if index >= n or shift > 60:
+                    raise ValueError("Truncated or malformed polyline")
+                b = np.int64(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1f) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            delta = ~(result >> 1) if result & 1 else result >> 1
+            if axis == 0:
+                lat += delta
+            else:
+                lon += delta
+        out[count, 0] = lat / factor
+        out[count, 1] = lon / factor
+        count += 1
+    return out[:count]
+
+
+def decode_polyline(encoded, precision=5):
+    """Decode an encoded polyline string straight into an (N, 2) NumPy array."""
+    return _decode_polyline_bytes(np.frombuffer(encoded.encode('ascii'), dtype=np.uint8), precision)
+
+
+@njit(fastmath=True, cache=True)
+def _bearing_deg(lat1, lon1, lat2, lon2):
+    """Initial bearing in degrees [0, 360) between two (lat, lon) points in radians."""
+    d_lon = lon2 - lon1
+    x = math.sin(d_lon) * math.cos(lat2)
+    y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(d_lon)
+    return (math.degrees(math.atan2(x, y)) + 360.0) % 360.0
+
+
+@njit(fastmath=True, cache=True)
+def _distance_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters between two (lat, lon) points in radians."""
+    dlon = lon2 - lon1
+    y = math.hypot(
+        math.cos(lat2) * math.sin(dlon),
+        math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+    )
+    x = math.sin(lat1) * math.sin(lat2) + math.cos(lat1) * math.cos(lat2) * math.cos(dlon)
+    return EARTH_RADIUS * math.atan2(y, x)
+
+
+@njit(cache=True)
+def _coverage_indices(pts_rad, spacing):
+    """Greedily pick route indices at least `spacing` meters from the previous pick."""
+    n = pts_rad.shape[0]
+    idx = np.empty(n, np.int64)
+    if n == 0:
+        return idx
+    idx[0] = 0
+    count = 1
+    for i in range(1, n):
+        last = idx[count - 1]
+        if _distance_m(pts_rad[last, 0], pts_rad[last, 1], pts_rad[i, 0], pts_rad[i, 1]) >= spacing:
+            idx[count] = i
+            count += 1
+    return idx[:count]
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _detect_turns_kernel(pts_rad, min_angle, min_dist, blind_thr, sw):
+    """Return (indices, angles, blind spot flags) of turns along pts_rad."""
+    n = pts_rad.shape[0] - sw - 1
+
+    # Bearing change at every point i in [1, n], independent per point
+    change = np.empty(n)
+    for j in prange(n):
+        i = j + 1
+        bearing_start = _bearing_deg(pts_rad[i - 1, 0], pts_rad[i - 1, 1], pts_rad[i, 0], pts_rad[i, 1])
+        bearing_end = _bearing_deg(pts_rad[i, 0], pts_rad[i, 1], pts_rad[i + sw - 1, 0], pts_rad[i + sw - 1, 1])
+        change[j] = abs((bearing_end - bearing_start + 180.0) % 360.0 - 180.0)
+
+    # Spacing check is sequential: each turn is measured from the last accepted one
+    idx = np.empty(n, np.int64)
+    angles = np.empty(n)
+    blind = np.empty(n, np.bool_)
+    count = 0
+    for j in range(n):
+        if change[j] >= min_angle:
+            i = j + 1
+            if count == 0 or _distance_m(pts_rad[idx[count - 1], 0], pts_rad[idx[count - 1], 1],
+                                         pts_rad[i, 0], pts_rad[i, 1]) >= min_dist:
+                idx[count] = i
+                angles[count] = change[j]
+                blind[count] = change[j] >= blind_thr
+                count += 1
+
+    return idx[:count], angles[:count], blind[:count]
+
+
+@njit(cache=True)
+def _distances_from_kernel(lat1, lon1, pts_rad):
+    out = np.empty(pts_rad.shape[0])
+    for i in range(pts_rad.shape[0]):
+        out[i] = _distance_m(lat1, lon1, pts_rad[i, 0], pts_rad[i, 1])
+    return out
+
+
+def _distances_from(origin, points):
+    """Great-circle distances in meters from origin to each (lat, lon) in points."""
+    lat1, lon1 = np.deg2rad(np.asarray(origin, dtype=np.float64))
+    pts = np.deg2rad(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+    return _distances_from_kernel(lat1, lon1, pts)
+
+
 class GoogleRouteAnalyzer:
-    def __init__(self, api_key, excel_path, output_folder):
+    def __init__(self, api_key, excel_path, output_folder, routes=None, max_concurrent_requests=50):
         self.api_key = api_key
         self.excel_path = excel_path
         self.output_folder = output_folder
@@ -19,19 +418,36 @@ class GoogleRouteAnalyzer:
         # Updated Places API endpoint
         self.places_url = "https://places.googleapis.com/v1/places:searchNearby"
         self.snap_to_roads_url = "https://roads.googleapis.com/v1/snapToRoads"
+        # Upper bound on in-flight Google API requests, to stay within quota
+        self.max_concurrent_requests = max_concurrent_requests
+
+        # Persistent session so synchronous API calls reuse pooled connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
         
-        # Create output folder if it doesn't exist
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
+        # Create output folder if it doesn't exist (pool workers may race here)
+        os.makedirs(output_folder, exist_ok=True)
+
+        # Parse the Excel file once (unless already loaded by the caller);
+        # every route lookup reuses this frame
+        self.routes = routes if routes is not None else self.load_routes(excel_path)
+
+    @staticmethod
+    def load_routes(excel_path):
+        """Read the route sheet, indexed by ID (first row wins for duplicates)."""
+        df = pd.read_excel(excel_path, engine='calamine')
+        return df.drop_duplicates(subset='ID').set_index('ID')
     
     def read_route_data(self, route_id):
         """Read route data from Excel file based on ID."""
         try:
-            # Read the Excel file
-            df = pd.read_excel(self.excel_path)
-            
-            # Filter data for the given ID
-            route_data = df[df['ID'] == route_id].iloc[0]
+            # Look up the cached row for the given ID
+            route_data = self.routes.loc[route_id]
             
             # Extract coordinates and waypoints
             destination = (float(route_data['Latitude']), float(route_data['Longitude']))
@@ -44,26 +460,12 @@ class GoogleRouteAnalyzer:
     def calculate_bearing(self, point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
         lat1, lon1 = map(math.radians, point1)
         lat2, lon2 = map(math.radians, point2)
-
-        d_lon = lon2 - lon1
-        x = math.sin(d_lon) * math.cos(lat2)
-        y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(d_lon)
-        
-        bearing = math.atan2(x, y)
-        bearing = math.degrees(bearing)
-        return (bearing + 360) % 360
+        return _bearing_deg(lat1, lon1, lat2, lon2)
 
     def calculate_distance(self, point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
-        R = 6371000  # Earth's radius in meters
         lat1, lon1 = map(math.radians, point1)
         lat2, lon2 = map(math.radians, point2)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        return R * c
+        return _distance_m(lat1, lon1, lat2, lon2)
 
     def detect_turns(self, points: List[Tuple[float, float]], 
                     min_angle: float = 45.0,
@@ -75,22 +477,19 @@ class GoogleRouteAnalyzer:
         if len(points) < sliding_window + 1:
             return turns
 
-        for i in range(1, len(points) - sliding_window):
-            prev_point = points[i - 1]
-            next_point = points[i + sliding_window - 1]
-
-            bearing_start = self.calculate_bearing(prev_point, points[i])
-            bearing_end = self.calculate_bearing(points[i], next_point)
-            bearing_change = abs((bearing_end - bearing_start + 180) % 360 - 180)
+        # Convert once; the JIT kernel works on a contiguous float64 array in radians
+        pts = np.deg2rad(np.asarray(points, dtype=np.float64))
+        idx, angles, blind = _detect_turns_kernel(
+            pts, float(min_angle), float(min_distance), float(blind_spot_threshold), int(sliding_window)
+        )
 
-            if bearing_change >= min_angle:
-                if not turns or self.calculate_distance(turns[-1]['point'], points[i]) >= min_distance:
-                    turn = {
-                        'point': points[i],
-                        'angle': round(bearing_change, 1),
-                        'is_blind_spot': bearing_change >= blind_spot_threshold
-                    }
-                    turns.append(turn)
+        for i, angle, is_blind_spot in zip(idx, angles, blind):
+            turn = {
+                'point': points[i],
+                'angle': round(float(angle), 1),
+                'is_blind_spot': bool(is_blind_spot)
+            }
+            turns.append(turn)
 
         return turns
 
@@ -106,7 +505,7 @@ class GoogleRouteAnalyzer:
                 'key': self.api_key
             }
 
-            response = requests.get(self.directions_url, params=params)
+            response = self.session.get(self.directions_url, params=params)
             response.raise_for_status()
             route_data = response.json()
             
@@ -118,41 +517,114 @@ class GoogleRouteAnalyzer:
             print(f"Error fetching route: {e}")
             return None
 
-    def snap_to_roads(self, route_points):
+    @asynccontextmanager
+    async def _api_session(self):
+        """Yield a pooled aiohttp session and the semaphore bounding its requests."""
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        headers = {"X-Goog-Api-Key": self.api_key}
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            yield session, asyncio.Semaphore(self.max_concurrent_requests)
+
+    async def _in_session(self, method, *args):
+        async with self._api_session() as (session, sem):
+            return await method(session, sem, *args)
+
+    async def _snap_chunk(self, session, sem, chunk, skip_first=False):
+        path = '|'.join([f"{point[0]},{point[1]}" for point in chunk])
+
+        params = {
+            'path': path,
+            'interpolate': 'true',
+            'key': self.api_key
+        }
+
+        async with sem:
+            async with session.get(self.snap_to_roads_url, params=params) as response:
+                response.raise_for_status()
+                snapped_data = await response.json()
+
+        snapped = snapped_data.get('snappedPoints', [])
+
+        # The first input point repeats the previous chunk's last one
+        if skip_first and snapped and snapped[0].get('originalIndex') == 0:
+            snapped = snapped[1:]
+
+        return [
+            (point['location']['latitude'], point['location']['longitude'])
+            for point in snapped
+        ]
+
+    async def _snap_to_roads_async(self, session, sem, route_points):
         snapped_points = []
 
-        # Split points into chunks of 100
+        # Split points into chunks of 100. Consecutive chunks share one point so
+        # the road between them is interpolated as well.
         chunk_size = 100
-        for i in range(0, len(route_points), chunk_size):
-            chunk = route_points[i:i + chunk_size]
-            path = '|'.join([f"{point[0]},{point[1]}" for point in chunk])
-            
-            params = {
-                'path': path,
-                'interpolate': True,
-                'key': self.api_key
-            }
-
-            try:
-                response = requests.get(self.snap_to_roads_url, params=params)
-                response.raise_for_status()
-                snapped_data = response.json()
-
-                snapped_points.extend([
-                    (point['location']['latitude'], point['location']['longitude'])
-                    for point in snapped_data['snappedPoints']
-                ])
-            except Exception as e:
-                print(f"Error snapping points in chunk {i // chunk_size + 1}: {e}")
+        chunks = [
+            route_points[i:i + chunk_size]
+            for i in range(0, max(len(route_points) - 1, 1), chunk_size - 1)
+        ] if len(route_points) else []
+
+        tasks = [
+            self._snap_chunk(session, sem, chunk, skip_first=chunk_idx > 0)
+            for chunk_idx, chunk in enumerate(chunks)
+        ]
+
+        # Chunks are snapped concurrently; gather keeps them in route order
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for chunk_idx, result in enumerate(results):
+            if isinstance(result, Exception):
+                print(f"Error snapping points in chunk {chunk_idx + 1}: {result}")
+                continue
+            snapped_points.extend(result)
         
         print(f"Snapped {len(snapped_points)} points to roads.")
         return snapped_points
 
+    def snap_to_roads(self, route_points):
+        return _run(self._in_session(self._snap_to_roads_async, route_points))
+
+    async def _fetch_places(self, session, sem, point, place_type, radius, max_retries=3):
+        """Query the Places API for one place type around a single point."""
+        # Create request body for new Places API
+        request_body = {
+            "locationRestriction": {
+                "circle": {
+                    "center": {
+                        "latitude": point[0],
+                        "longitude": point[1]
+                    },
+                    "radius": radius
+                }
+            },
+            "includedTypes": [place_type],
+            "maxResultCount": PLACES_MAX_RESULTS
+        }
 
-    def get_places_along_route(self, snapped_points, place_types, radius=1000, proximity_threshold=100):
+        # API key and content type are session-wide; only the field mask is per request
+        headers = {
+            "X-Goog-FieldMask": "places.id,places.displayName,places.location,places.formattedAddress"
+        }
+
+        async with sem:
+            for attempt in range(max_retries + 1):
+                async with session.post(self.places_url, json=request_body, headers=headers) as response:
+                    # Handle rate limiting
+                    if response.status == 429 and attempt < max_retries:
+                        print("Rate limit reached. Pausing for 2 seconds...")
+                        await asyncio.sleep(2)
+                        continue
+                    response.raise_for_status()
+                    return await response.json()
+
+    async def _get_places_async(self, session, sem, snapped_points, place_types, radius=1000, proximity_threshold=100):
         places = []
-        sampled_points = snapped_points[::10]
-        print(f"Processing {len(sampled_points)} points along the snapped route...")
+
+        # Query centers spaced 0.7 * radius apart along the route: neighbouring
+        # search circles still overlap, but far less than a fixed stride would
+        pts = np.deg2rad(np.asarray(snapped_points, dtype=np.float64).reshape(-1, 2))
+        center_indices = [int(i) for i in _coverage_indices(pts, 0.7 * radius)]
+        print(f"Processing {len(center_indices)} points along the snapped route...")
 
         # Map old place types to new ones
         place_type_mapping = {
@@ -162,69 +634,109 @@ class GoogleRouteAnalyzer:
             'train_station': 'train_station'
         }
 
-        for idx, point in enumerate(sampled_points):
-            for place_type in place_types:
-                try:
-                    # Map the old place type to new format
-                    new_place_type = place_type_mapping.get(place_type, place_type)
-                    
-                    # Create request body for new Places API
-                    request_body = {
-                        "locationRestriction": {
-                            "circle": {
-                                "center": {
-                                    "latitude": point[0],
-                                    "longitude": point[1]
-                                },
-                                "radius": radius
-                            }
-                        },
-                        "includedTypes": [new_place_type],
-                        "maxResultCount": 20
-                    }
-                    
-                    # Set up headers with API key
-                    headers = {
-                        "Content-Type": "application/json",
-                        "X-Goog-Api-Key": self.api_key,
-                        "X-Goog-FieldMask": "places.displayName,places.location,places.formattedAddress"
-                    }
-                    
-                    # Make the request
-                    response = requests.post(self.places_url, json=request_body, headers=headers)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # Process results
-                    if 'places' in data:
-                        for result in data['places']:
-                            place_location = (
-                                result['location']['latitude'],
-                                result['location']['longitude']
-                            )
-                            closest_distance = min(
-                                geodesic(place_location, snapped_point).meters
-                                for snapped_point in snapped_points
-                            )
-                            if closest_distance <= proximity_threshold:
-                                place = {
-                                    'name': result.get('displayName', {}).get('text', 'Unnamed Place'),
-                                    'location': place_location,
-                                    'type': place_type,
-                                    'address': result.get('formattedAddress', 'No address available')
-                                }
-                                places.append(place)
-                    
-                    # Handle rate limiting
-                    if response.status_code == 429:
-                        print("Rate limit reached. Pausing for 2 seconds...")
-                        time.sleep(2)
-                except Exception as e:
-                    print(f"Error fetching POIs at point {idx}: {e}")
-                    continue
+        async def fetch(queries):
+            tasks = [
+                self._fetch_places(session, sem, snapped_points[idx], place_type_mapping.get(place_type, place_type), radius)
+                for idx, place_type in queries
+            ]
+            # All (point, place type) queries run concurrently, bounded by the semaphore
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        queries = [(idx, place_type) for idx in center_indices for place_type in place_types]
+        responses = await fetch(queries)
+
+        # A full page means the result cap may have hidden POIs around that
+        # center. Re-query that type at the dense every-10th-point sampling
+        # between the neighbouring centers.
+        center_pos = {idx: pos for pos, idx in enumerate(center_indices)}
+        extra_queries = set()
+        for (idx, place_type), data in zip(queries, responses):
+            if isinstance(data, Exception) or len(data.get('places', [])) < PLACES_MAX_RESULTS:
+                continue
+            pos = center_pos[idx]
+            start = center_indices[pos - 1] if pos > 0 else 0
+            stop = center_indices[pos + 1] if pos + 1 < len(center_indices) else len(snapped_points)
+            # Align to multiples of 10 so neighbouring saturated centers share points
+            extra_queries.update(
+                (i, place_type) for i in range(start + (-start) % 10, stop, 10) if i not in center_pos
+            )
+        if extra_queries:
+            extra_queries = sorted(extra_queries)
+            print(f"Refining {len(extra_queries)} queries around saturated search circles...")
+            queries += extra_queries
+            responses += await fetch(extra_queries)
+
+        # Overlapping circles return the same place more than once; keep the
+        # first hit per (place type, place id)
+        candidates = {}
+        for (idx, place_type), data in zip(queries, responses):
+            if isinstance(data, Exception):
+                print(f"Error fetching POIs at point {idx}: {data}")
+                continue
+
+            for result in data.get('places', []):
+                place_id = result.get('id') or (
+                    result['location']['latitude'], result['location']['longitude']
+                )
+                candidates.setdefault((place_type, place_id), (place_type, result))
+        candidates = list(candidates.values())
+
+        if not candidates or not snapped_points:
+            return places
+
+        # Index the snapped route once; each place then needs a single
+        # O(log S) nearest-neighbour lookup instead of S geodesic calls
+        cos_lat = math.cos(math.radians(np.mean([p[0] for p in snapped_points])))
+        route_tree = cKDTree(_project_equirectangular(snapped_points, cos_lat))
+
+        candidate_locations = [
+            (result['location']['latitude'], result['location']['longitude'])
+            for _, result in candidates
+        ]
+        candidate_xy = _project_equirectangular(candidate_locations, cos_lat)
+        closest_distances, _ = route_tree.query(candidate_xy)
+
+        # The projection is only approximate: it uses one cos(lat) for the whole
+        # route and a spherical earth. Estimates within that error of the
+        # threshold are re-measured with geodesic against their nearest points.
+        route_cos = np.cos(pts[:, 0])
+        band = proximity_threshold * (np.max(np.abs(route_cos / cos_lat - 1)) + 0.01)
+        borderline = np.flatnonzero(np.abs(closest_distances - proximity_threshold) <= band)
+        if len(borderline):
+            k = min(8, len(snapped_points))
+            _, neighbours = route_tree.query(candidate_xy[borderline], k=k)
+            for j, nearest in zip(borderline, neighbours.reshape(len(borderline), k)):
+                closest_distances[j] = min(
+                    geodesic(candidate_locations[j], snapped_points[i]).meters
+                    for i in nearest
+                )
+
+        # Process results
+        for (place_type, result), place_location, closest_distance in zip(
+                candidates, candidate_locations, closest_distances):
+            if closest_distance <= proximity_threshold:
+                place = {
+                    'name': result.get('displayName', {}).get('text', 'Unnamed Place'),
+                    'location': place_location,
+                    'type': place_type,
+                    'address': result.get('formattedAddress', 'No address available')
+                }
+                places.append(place)
         
         return places
 
+    def get_places_along_route(self, snapped_points, place_types, radius=1000, proximity_threshold=100):
+        return _run(self._in_session(
+            self._get_places_async, snapped_points, place_types, radius, proximity_threshold
+        ))
+
+    async def _snap_and_find_places(self, route_points, place_types):
+        """Snap the route and collect POIs along it over one shared session."""
+        async with self._api_session() as (session, sem):
+            snapped_points = await self._snap_to_roads_async(session, sem, route_points)
+            pois = await self._get_places_async(session, sem, snapped_points, place_types)
+        return snapped_points, pois
+
     def create_map(self, origin, destination, route_id):
         route_data = self.get_route(origin, destination)
         if not route_data:
@@ -233,10 +745,13 @@ class GoogleRouteAnalyzer:
 
         route = route_data['routes'][0]
         leg = route['legs'][0]
-        original_points = polyline.decode(route['overview_polyline']['points'])
+        original_points = decode_polyline(route['overview_polyline']['points'])
 
         print(f"Route fetched with {len(original_points)} points.")
-        snapped_points = self.snap_to_roads(original_points)
+
+        # Snapping and the POI search share one HTTP session and event loop
+        place_types = ['hospital', 'police', 'gas_station', 'train_station']
+        snapped_points, pois = _run(self._snap_and_find_places(original_points, place_types))
 
         # Detect turns and blind spots
         turns = self.detect_turns(
@@ -250,10 +765,6 @@ class GoogleRouteAnalyzer:
         # Count blind spots
         blind_spots = [turn for turn in turns if turn['is_blind_spot']]
 
-        # Detect POIs
-        place_types = ['hospital', 'police', 'gas_station', 'train_station']
-        pois = self.get_places_along_route(snapped_points, place_types)
-
         # Collect data for Excel export
         marker_data = []
 
@@ -271,6 +782,10 @@ class GoogleRouteAnalyzer:
             'train_station': {'icon': 'train', 'color': 'purple', 'prefix': 'fa'}
         }
 
+        # Turns and blind spots carry unique popups, so they stay individual
+        # markers but share one layer
+        turn_layer = PrerenderedMarkerGroup(name='Turns & Blind Spots').add_to(m)
+
         # Add turn and blind spot markers
         for turn in turns:
             category = 'Blind Spot' if turn['is_blind_spot'] else 'Turn'
@@ -290,29 +805,22 @@ class GoogleRouteAnalyzer:
                     fill=True,
                     fillColor='red',
                     fillOpacity=0.3
-                ).add_to(m)
+                ).add_to(turn_layer)
                 
                 # Add warning icon
-                folium.Marker(
-                    location=turn['point'],
-                    popup=f"""
-                        <div style="font-family: Arial, sans-serif;">
-                            <h4 style="color: red;">⚠️ BLIND SPOT WARNING ⚠️</h4>
-                            <b>Turn Angle:</b> {turn['angle']}°<br>
-                            <b>Hazard Level:</b> High<br>
-                            <small>Exercise extreme caution!</small>
-                        </div>
-                    """,
-                    icon=folium.Icon(color='red', icon='exclamation-triangle', prefix='fa')
-                ).add_to(m)
+                turn_layer.add_marker(
+                    turn['point'], BLIND_SPOT_POPUP % turn['angle'],
+                    color='red', icon='exclamation-triangle'
+                )
             else:
-                folium.Marker(
-                    location=turn['point'],
-                    popup=f"Turn Angle: {turn['angle']}°",
-                    icon=folium.Icon(color='yellow', icon='refresh', prefix='fa')
-                ).add_to(m)
-
-        # Add POI markers with custom icons
+                turn_layer.add_marker(
+                    turn['point'], TURN_POPUP % turn['angle'],
+                    color='yellow', icon='refresh'
+                )
+
+        # Collect POI rows per type; each type is rendered client-side as one
+        # clustered layer instead of one Marker element per POI
+        poi_rows = {}
         for poi in pois:
             marker_data.append({
                 'Category': poi['type'].capitalize(),
@@ -321,66 +829,45 @@ class GoogleRouteAnalyzer:
                 'Name': poi['name']
             })
 
-            icon_config = place_icons.get(poi['type'], {'icon': 'info-sign', 'color': 'gray', 'prefix': 'fa'})
-            popup_text = f"""
-                <div style="font-family: Arial, sans-serif;">
-                    <h4>{poi['name']}</h4>
-                    <b>Type:</b> {poi['type'].capitalize()}<br>
-                    <b>Address:</b> {poi['address']}<br>
-                    <small>Lat: {poi['location'][0]}, Lon: {poi['location'][1]}</small>
-                </div>
-            """
-            folium.Marker(
-                location=poi['location'],
-                popup=popup_text,
-                icon=folium.Icon(**icon_config)
+            popup_text = POI_POPUP % (
+                poi['name'], poi['type'].capitalize(), poi['address'],
+                poi['location'][0], poi['location'][1]
+            )
+            poi_rows.setdefault(poi['type'], []).append(
+                [poi['location'][0], poi['location'][1], popup_text]
+            )
+
+        # Add POI clusters with custom icons
+        for place_type, rows in poi_rows.items():
+            icon_config = place_icons.get(place_type, {'icon': 'info-sign', 'color': 'gray', 'prefix': 'fa'})
+            FastMarkerCluster(
+                rows,
+                callback=POI_MARKER_CALLBACK % icon_config,
+                name=place_type.replace('_', ' ').title()
             ).add_to(m)
 
+        folium.LayerControl(position='bottomleft').add_to(m)
+
         # Add start marker with detailed information
-        start_popup = f"""
-            <div style="font-family: Arial, sans-serif;">
-                <h4>Route Information</h4>
-                <b>Start:</b> {leg['start_address']}<br>
-                <b>Distance:</b> {leg['distance']['text']}<br>
-                <b>Duration:</b> {leg['duration']['text']}<br>
-                <b>Total Turns:</b> {len(turns)}<br>
-                <b>Blind Spots:</b> {len(blind_spots)}<br>
-                <small>Exercise caution at marked hazard points</small>
-            </div>
-        """
+        start_popup = START_POPUP % (
+            leg['start_address'], leg['distance']['text'], leg['duration']['text'],
+            len(turns), len(blind_spots)
+        )
         folium.Marker(
             origin,
-            popup=start_popup,
+            popup=folium.Popup(start_popup, max_width=300, lazy=True),
             icon=folium.Icon(color="green", icon="flag", prefix="fa")
         ).add_to(m)
 
         # Add end marker
         folium.Marker(
             destination,
-            popup=f"End: {leg['end_address']}",
+            popup=folium.Popup(f"End: {leg['end_address']}", lazy=True),
             icon=folium.Icon(color="red", icon="flag-checkered", prefix="fa")
         ).add_to(m)
 
         # Add HTML legend
-        legend_html = '''
-            <div style="position: fixed; 
-                        top: 10px; right: 10px; width: 150px;
-                        border:2px solid grey; z-index:9999; font-size:14px;
-                        background-color: white;
-                        padding: 10px;
-                        border-radius: 5px;">
-                <h4 style="margin-bottom: 10px;">Legend</h4>
-                <div style="margin-bottom: 5px;"><i class="fa fa-plus fa-lg" style="color:red"></i> Hospital</div>
-                <div style="margin-bottom: 5px;"><i class="fa fa-shield fa-lg" style="color:blue"></i> Police</div>
-                <div style="margin-bottom: 5px;"><i class="fa fa-gas-pump fa-lg" style="color:orange"></i> Gas Station</div>
-                <div style="margin-bottom: 5px;"><i class="fa fa-train fa-lg" style="color:purple"></i> Train Station</div>
-                <div style="margin-bottom: 5px;"><i class="fa fa-refresh fa-lg" style="color:yellow"></i> Turn</div>
-                <div style="margin-bottom: 5px;"><i class="fa fa-exclamation-triangle fa-lg" style="color:red"></i> Blind Spot</div>
-                <div style="margin-bottom: 5px;"><i class="fa fa-flag fa-lg" style="color:green"></i> Start</div>
-                <div><i class="fa fa-flag-checkered fa-lg" style="color:red"></i> End</div>
-            </div>
-        '''
-        m.get_root().html.add_child(folium.Element(legend_html))
+        m.get_root().html.add_child(_RawElement(LEGEND_HTML))
 
         # Save the marker data to Excel
         self.save_to_excel(marker_data, origin, route_id)
@@ -390,73 +877,52 @@ class GoogleRouteAnalyzer:
     def save_to_excel(self, marker_data, origin, route_id):
         """Save route analysis data to Excel file."""
         try:
-            # Modify the marker_data to include turn angle, risk type, and distance to start
-            enhanced_marker_data = []
-            for marker in marker_data:
-                # Extract turn angle from the Name field for turns and blind spots
-                turn_angle = 0
-                risk_type = "Low Risk"
-                
-                if marker['Category'] in ['Turn', 'Blind Spot']:
-                    # Extract turn angle from the Name field
-                    angle_match = marker['Name'].split(': ')
-                    if len(angle_match) > 1:
-                        try:
-                            turn_angle = float(angle_match[1].rstrip('°'))
-                            
-                            # Determine risk type based on turn angle
-                            if turn_angle >= 60:
-                                risk_type = "High Risk"
-                            elif turn_angle >= 35:
-                                risk_type = "Medium Risk"
-                            else:
-                                risk_type = "Low Risk"
-                        except ValueError:
-                            pass
-                
-                # Calculate distance to start
-                marker_location = (marker['Latitude'], marker['Longitude'])
-                distance_to_start = self.calculate_distance(origin, marker_location)
-                
-                enhanced_marker = marker.copy()
-                enhanced_marker['Route ID'] = route_id  # Add route_id to each row
-                enhanced_marker['Turn Angle'] = turn_angle
-                enhanced_marker['Risk Type'] = risk_type
-                enhanced_marker['Distance to Start (km)'] = round(distance_to_start/1000, 2)
-                
-                enhanced_marker_data.append(enhanced_marker)
-            
-            # Create DataFrame with enhanced data
-            df = pd.DataFrame(enhanced_marker_data)
-            
-            # Reorder columns to place new columns in a logical order
-            columns_order = [
-                'Route ID',
-                'Category',
-                'Name',
-                'Latitude',
-                'Longitude',
-                'Turn Angle',
-                'Risk Type',
-                'Distance to Start (km)'
-            ]
-            df = df[columns_order]
+            # Build the frame straight from the marker dicts and derive the
+            # analysis columns column-wise, appended in their output order
+            df = pd.DataFrame(marker_data, columns=['Category', 'Name', 'Latitude', 'Longitude'])
+            df.insert(0, 'Route ID', route_id)  # Add route_id to each row
+
+            # Extract turn angle from the Name field for turns and blind spots
+            is_turn = df['Category'].isin(['Turn', 'Blind Spot'])
+            df['Turn Angle'] = (
+                df['Name'].where(is_turn)
+                .str.extract(r'([\d.]+)°', expand=False)
+                .astype(float)
+                .fillna(0)
+            )
+
+            # Determine risk type based on turn angle
+            df['Risk Type'] = pd.cut(
+                df['Turn Angle'],
+                bins=[-np.inf, 35, 60, np.inf],
+                right=False,
+                labels=['Low Risk', 'Medium Risk', 'High Risk']
+            )
+
+            # Distance to start for all markers in a single vectorised call
+            distances = _distances_from(origin, df[['Latitude', 'Longitude']].to_numpy())
+            df['Distance to Start (km)'] = np.round(distances / 1000, 2)
             
             # Create the output filename with route_id
             file_path = os.path.join(self.output_folder, f'{route_id}.xlsx')
             
-            # Save to Excel with formatting
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Route Analysis')
-                
-                # Auto-adjust column widths
-                worksheet = writer.sheets['Route Analysis']
+            # Save to Excel with formatting. Rows are streamed in order through
+            # xlsxwriter's constant_memory mode; pandas' to_excel writes column by
+            # column, which constant_memory would silently drop, so rows are
+            # written directly.
+            with xlsxwriter.Workbook(file_path, {'constant_memory': True}) as workbook:
+                worksheet = workbook.add_worksheet('Route Analysis')
+                header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+
+                # Auto-adjust column widths from a sample of the rows
+                sample = df.head(200)
                 for idx, col in enumerate(df.columns):
-                    max_length = max(
-                        df[col].astype(str).apply(len).max(),
-                        len(col)
-                    ) + 2
-                    worksheet.column_dimensions[chr(65 + idx)].width = max_length
+                    max_length = max([len(col)] + [len(str(v)) for v in sample[col]]) + 2
+                    worksheet.set_column(idx, idx, max_length)
+
+                worksheet.write_row(0, 0, df.columns, header_format)
+                for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+                    worksheet.write_row(row_idx, 0, row)
 
             print(f"Excel file generated successfully at: {file_path}")
             
@@ -464,187 +930,60 @@ class GoogleRouteAnalyzer:
             print(f"Error saving data to Excel: {e}")
             raise  # Re-raise the exception for better error tracking
 
+
 def save_map(map_obj, output_folder, route_id):
     try:
-        # The GPS tracking script remains largely the same as before
-        gps_script = """
-        <div id="gps-tracking" style="
-            position: fixed; 
-            top: 10px; 
-            right: 10px; 
-            background: white; 
-            padding: 10px; 
-            border: 1px solid #ccc; 
-            z-index: 1000; 
-            font-family: Arial, sans-serif;
-        ">
-            <button id="start-tracking" style="
-                background-color: green; 
-                color: white; 
-                border: none; 
-                padding: 10px; 
-                margin-bottom: 10px;
-                cursor: pointer;
-            ">Start Tracking</button>
-            <div id="gps-status">GPS: Not Connected</div>
-            <div id="gps-coordinates"></div>
-            <div id="tracking-info"></div>
-        </div>
-        <script>
-        function initGPS() {
-            const startButton = document.getElementById('start-tracking');
-            const gpsStatus = document.getElementById('gps-status');
-            const gpsCoordinates = document.getElementById('gps-coordinates');
-            const trackingInfo = document.getElementById('tracking-info');
-            let userMarker = null;
-            let trackingStarted = false;
-            let trackingStartTime = null;
-            let totalDistance = 0;
-            let previousPosition = null;
-
-            function updateGPSMarker(lat, lon) {
-                if (!userMarker) {
-                    userMarker = L.marker([lat, lon], {
-                        icon: L.divIcon({
-                            className: 'custom-gps-marker',
-                            html: `<div style="
-                                width: 30px; 
-                                height: 30px; 
-                                background-color: green; 
-                                border-radius: 50%; 
-                                border: 3px solid white;
-                                box-shadow: 0 0 15px rgba(0,255,0,0.5);
-                            "></div>`,
-                            iconSize: [30, 30],
-                            iconAnchor: [15, 15]
-                        })
-                    }).addTo(map);
-                } else {
-                    // Calculate distance moved
-                    if (previousPosition && trackingStarted) {
-                        const distanceMoved = L.latLng([lat, lon]).distanceTo(previousPosition);
-                        totalDistance += distanceMoved;
-                    }
-                    
-                    userMarker.setLatLng([lat, lon]);
-                    previousPosition = L.latLng([lat, lon]);
-                }
-                
-                // Center map on current location
-                map.setView([lat, lon], map.getZoom());
-            }
-
-            startButton.addEventListener('click', function() {
-                if (!trackingStarted) {
-                    trackingStarted = true;
-                    trackingStartTime = new Date();
-                    startButton.textContent = 'Stop Tracking';
-                    startButton.style.backgroundColor = 'red';
-                    trackingInfo.innerHTML = 'Tracking started...';
-                } else {
-                    trackingStarted = false;
-                    const trackingDuration = (new Date() - trackingStartTime) / 1000 / 60; // minutes
-                    trackingInfo.innerHTML = `
-                        Tracking stopped<br>
-                        Duration: ${trackingDuration.toFixed(2)} minutes<br>
-                        Total Distance: ${(totalDistance / 1000).toFixed(2)} km
-                    `;
-                    startButton.textContent = 'Start Tracking';
-                    startButton.style.backgroundColor = 'green';
-                }
-            });
-
-            if ('geolocation' in navigator) {
-                navigator.geolocation.watchPosition(
-                    function(position) {
-                        const lat = position.coords.latitude;
-                        const lon = position.coords.longitude;
-                        const accuracy = position.coords.accuracy;
-
-                        updateGPSMarker(lat, lon);
-                        
-                        gpsStatus.innerHTML = 'GPS: Connected';
-                        gpsCoordinates.innerHTML = `
-                            Latitude: ${lat.toFixed(6)}<br>
-                            Longitude: ${lon.toFixed(6)}<br>
-                            Accuracy: ${accuracy.toFixed(2)} meters
-                        `;
-
-                        if (trackingStarted) {
-                            trackingInfo.innerHTML = `
-                                Tracking Active<br>
-                                Total Distance: ${(totalDistance / 1000).toFixed(2)} km
-                            `;
-                        }
-                    },
-                    function(error) {
-                        gpsStatus.innerHTML = `GPS Error: ${error.message}`;
-                        console.error('Geolocation error:', error);
-                    },
-                    {
-                        enableHighAccuracy: true,
-                        maximumAge: 30000,
-                        timeout: 27000
-                    }
-                );
-            } else {
-                gpsStatus.innerHTML = 'Geolocation not supported';
-            }
-        }
-
-        // Initialize GPS tracking after map load
-        map.whenReady(initGPS);
-        </script>
-        """
-        
         # Add the GPS tracking HTML and script to the map
-        map_obj.get_root().html.add_child(folium.Element(gps_script))
-        # Add GPS tracking HTML and script
-        gps_tracking_html = '''
-        <div id="gps-tracking" style="
-            position: fixed; 
-            top: 10px; 
-            right: 10px; 
-            background: white; 
-            padding: 10px; 
-            border: 1px solid #ccc; 
-            z-index: 1000; 
-            font-family: Arial, sans-serif;
-        ">
-            <button id="start-tracking">Start Tracking</button>
-            <div id="gps-status">GPS: Disconnected</div>
-        </div>
-        <script>
-        var userMarker = null;
-        document.getElementById('start-tracking').addEventListener('click', function() {
-            if ('geolocation' in navigator) {
-                navigator.geolocation.watchPosition(function(position) {
-                    var lat = position.coords.latitude;
-                    var lon = position.coords.longitude;
-                    
-                    document.getElementById('gps-status').innerHTML = 
-                        `GPS: Active (${lat.toFixed(6)}, ${lon.toFixed(6)})`;
-                    
-                    if (!userMarker) {
-                        userMarker = L.marker([lat, lon]).addTo(map);
-                    } else {
-                        userMarker.setLatLng([lat, lon]);
-                    }
-                    
-                    map.setView([lat, lon], map.getZoom());
-                });
-            }
-        });
-        </script>
-        '''
-        map_obj.get_root().html.add_child(folium.Element(gps_tracking_html))
+        map_obj.get_root().html.add_child(_RawElement(GPS_TRACKING_HTML))
         
         file_path = os.path.join(output_folder, f'{route_id}.html')
-        map_obj.save(file_path)
-        print(f"Map saved to: {file_path}")
+
+        # Render once, then write the plain map and a gzip copy for serving
+        # with Content-Encoding: gzip
+        html = map_obj.get_root().render().encode('utf8')
+        with open(file_path, 'wb') as f:
+            f.write(html)
+        with gzip.open(file_path + '.gz', 'wb', compresslevel=6) as f:
+            f.write(html)
+        print(f"Map saved to: {file_path} (+ .gz)")
     except Exception as e:
         print(f"Error saving map: {e}")
 
+# Analyzer owned by the current worker process, set up by _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(api_key, excel_path, output_folder, routes, max_concurrent_requests):
+    global _worker_analyzer
+    # Parallelism comes from the pool; one Numba thread per worker avoids oversubscription
+    set_num_threads(1)
+    _worker_analyzer = GoogleRouteAnalyzer(
+        api_key, excel_path, output_folder,
+        routes=routes, max_concurrent_requests=max_concurrent_requests
+    )
+
+
+def _process_route(origin, route_id):
+    """Create and save the map for one route with this worker's analyzer."""
+    analyzer = _worker_analyzer
+    print(f"\nProcessing route {route_id}")
+    
+    # Get destination and waypoints for this route
+    destination = analyzer.read_route_data(route_id)
+    
+    if destination:
+        # Create map for this route
+        result = analyzer.create_map(origin, destination, route_id)
+        if result:
+            route_map, marker_data = result
+            # Save map
+            save_map(route_map, analyzer.output_folder, route_id)
+            print(f"Route {route_id} processed successfully")
+        else:
+            print(f"Failed to create map for route {route_id}")
+    else:
+        print(f"Failed to read data for route {route_id}")
+
 def main():
     try:
         # Configuration
@@ -654,32 +993,26 @@ def main():
         excel_path =  #Path of excel file
         output_folder = #Path of output folder
         origin = ()  # Fixed origin point
+        max_workers = min(4, os.cpu_count() or 1)  # Parallel route workers
+        max_concurrent_requests = 50  # In-flight Google API requests across all workers
         
-        # Initialize analyzer
-        analyzer = GoogleRouteAnalyzer(api_key, excel_path, output_folder)
+        # Read the Excel file once; workers receive the parsed routes
+        routes = GoogleRouteAnalyzer.load_routes(excel_path)
+        route_ids = list(routes.index)
+        os.makedirs(output_folder, exist_ok=True)
         
-        # Read the Excel file to get all route IDs
-        df = pd.read_excel(excel_path)
-        route_ids = df['ID'].unique()
-        
-        # Process each route
-        for route_id in route_ids:
-            print(f"\nProcessing route {route_id}")
-            
-            # Get destination and waypoints for this route
-            destination = analyzer.read_route_data(route_id)
-            
-            if destination:
-                # Create map for this route
-                route_map, marker_data = analyzer.create_map(origin, destination, route_id)
-                if route_map:
-                    # Save map
-                    save_map(route_map, output_folder, route_id)
-                    print(f"Route {route_id} processed successfully")
-                else:
-                    print(f"Failed to create map for route {route_id}")
-            else:
-                print(f"Failed to read data for route {route_id}")
+        # Routes are independent, so process them in parallel, one analyzer per
+        # worker. The request budget is split between workers so the pool as a
+        # whole stays within max_concurrent_requests.
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(
+                api_key, excel_path, output_folder, routes,
+                max(1, max_concurrent_requests // max_workers)
+            )
+        ) as executor:
+            list(executor.map(partial(_process_route, origin), route_ids))
                 
     except Exception as e:
         print(f"Error in main: {e}")